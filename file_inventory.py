@@ -3,10 +3,32 @@
 import os
 import time
 import argparse
+import string
 import sys
 import html  # For escaping HTML characters
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import lru_cache
+from itertools import islice
 from urllib.parse import quote  # For URL encoding
 
+# os.scandir() accepts directory file descriptors on POSIX systems, but not on Windows
+SCANDIR_SUPPORTS_FD = os.scandir in os.supports_fd
+
+# Output file extensions that are kept as given instead of having the format's extension appended
+OUTPUT_EXTENSIONS = frozenset(('.txt', '.html'))
+
+# Characters that quote() leaves unencoded in paths
+URL_SAFE_CHARS = string.ascii_letters + string.digits + '_.-~/'
+
+# Number of file paths written to the output file per write call
+WRITE_BATCH_SIZE = 1024
+
+# Size in bytes of the output file buffer
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+# Space reserved for the file count at the top of a streamed output, which is filled in after the files are written
+COUNT_WIDTH = 20
+
 def parse_arguments():
     """
     Parse command-line arguments.
@@ -14,7 +36,8 @@ def parse_arguments():
     Returns:
         argparse.Namespace: Parsed arguments containing directories, optional output file name,
                             file extensions for filtering, sorting criteria, order, depth control,
-                            output format, an option to skip hidden files, and substrings to filter by.
+                            output format, an option to skip hidden files, substrings to filter by,
+                            and the number of scanning threads.
     """
     parser = argparse.ArgumentParser(
         description="List all files within specified directories and save their paths to a text or HTML file."
@@ -95,8 +118,18 @@ def parse_arguments():
         default='or',
         help="Define how multiple substrings are matched in the --contains filter: 'and' requires all substrings to be present, 'or' requires any substring to be present. Default is 'or'."
     )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of threads scanning directories in parallel. Helps on slow or network filesystems; with more than 1, unsorted output is not in a fixed order. Default is 1."
+    )
     
-    return parser.parse_args()
+    args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("argument --workers: must be at least 1")
+    return args
 
 def generate_output_filename(provided_name=None, output_format='txt'):
     """
@@ -111,91 +144,380 @@ def generate_output_filename(provided_name=None, output_format='txt'):
     """
     if provided_name:
         _, ext = os.path.splitext(provided_name)
-        if ext.lower() not in ['.txt', '.html']:
+        if ext.lower() not in OUTPUT_EXTENSIONS:
             provided_name += f'.{output_format}'
         return provided_name
     else:
         timestamp = int(time.time())
         return f'file_list_{timestamp}.{output_format}'
 
-def get_file_info(file_path):
+@lru_cache(maxsize=16)
+def normalize_extensions(extensions):
+    """
+    Normalize file extensions to lowercase with a leading dot.
+
+    The result is cached, so repeated list_files() calls with the same extensions reuse it.
+
+    Args:
+        extensions (tuple): File extensions, with or without a leading dot.
+
+    Returns:
+        frozenset: Set of normalized extensions for constant-time lookups.
+    """
+    return frozenset(ext.lower() if ext.startswith('.') else f'.{ext.lower()}' for ext in extensions)
+
+def get_file_info(prefix, entry):
     """
     Retrieve file information needed for sorting.
 
     Args:
-        file_path (str): The full path to the file.
+        prefix (str): The directory prefix of the file, used to report errors.
+        entry (os.DirEntry): The directory entry of the file.
 
     Returns:
-        dict: Dictionary containing file name, size, and modification date.
+        os.stat_result: The file's stat result, whose st_size and st_mtime are used for sorting.
     """
     try:
-        stats = os.stat(file_path)
-        return {
-            'name': os.path.basename(file_path),
-            'size': stats.st_size,
-            'date': stats.st_mtime
-        }
+        # DirEntry caches its stat result, so this reuses any metadata already fetched by scandir
+        return entry.stat()
     except Exception as e:
-        print(f"Error accessing file '{file_path}': {e}", file=sys.stderr)
+        # The full path is only built here, for the message
+        print(f"Error accessing file '{prefix}{entry.name}': {e}", file=sys.stderr)
         return None
 
-def path_to_file_url(path):
+def quote_path(path):
     """
-    Convert a file system path to a properly formatted file URL.
+    URL-encode a path, returning it unchanged when it contains no characters that need encoding.
 
     Args:
-        path (str): The file system path.
+        path (str): The path to encode.
 
     Returns:
-        str: The file URL.
+        str: The URL-encoded path.
     """
-    if os.name == 'nt':
+    # Stripping every safe character leaves nothing for plain ASCII paths, which skips quote()'s byte encoding
+    if not path.rstrip(URL_SAFE_CHARS):
+        return path
+    return quote(path)
+
+# The platform check is made once here rather than for every path written to an HTML listing
+if os.name == 'nt':
+    def path_to_file_url(path):
+        """
+        Convert a Windows file system path to a properly formatted file URL.
+
+        Args:
+            path (str): The file system path.
+
+        Returns:
+            str: The file URL.
+        """
         # Replace backslashes with forward slashes for Windows paths
         path = path.replace('\\', '/')
         # Remove any leading slashes to prevent 'file:////' URLs
         path = path.lstrip('/')
         # URL-encode the path to handle spaces and special characters
-        return f'file:///{quote(path)}'
-    else:
+        return f'file:///{quote_path(path)}'
+else:
+    def path_to_file_url(path):
+        """
+        Convert a file system path to a properly formatted file URL.
+
+        Args:
+            path (str): The file system path.
+
+        Returns:
+            str: The file URL.
+        """
         # For Unix-like systems, prepend 'file://'
-        return f'file://{quote(path)}'
+        return f'file://{quote_path(path)}'
 
-def traverse_directory(directory, max_depth, skip_hidden, current_depth=0):
+def scan_directory(directory, skip_hidden, subdirectories=None, extensions=None, contains=None,
+                   case_sensitive=False, contains_mode='or'):
     """
-    Traverse the directory up to the specified depth.
+    Scan a single directory, without descending into its subdirectories.
+
+    Files are filtered here, as they are found, so rejected entries never leave the scan.
+
+    Where supported, the directory is scanned through an open file descriptor so that
+    DirEntry.stat() resolves the file relative to it instead of walking the full path again.
+    Entries must therefore be stat'ed before the generator is advanced.
 
     Args:
-        directory (str): The directory to traverse.
-        max_depth (int): Maximum depth to traverse. -1 for unlimited.
+        directory (str): The directory to scan.
         skip_hidden (bool): Whether to skip hidden files and directories.
-        current_depth (int, optional): Current depth level. Defaults to 0.
+        subdirectories (list, optional): List to append the paths of subdirectories to.
+                                         Subdirectories are ignored if not provided.
+        extensions (frozenset, optional): Set of normalized file extensions to filter by.
+        contains (list, optional): List of substrings to filter file names, lowercased unless case_sensitive.
+        case_sensitive (bool): Whether the --contains filter is case-sensitive.
+        contains_mode (str): Logical operation for multiple substrings ('and' or 'or').
 
     Yields:
-        str: File path.
+        tuple: Directory prefix (the directory path with a trailing separator, shared by all
+               files in the directory) and the os.DirEntry of each file that passes the filters.
     """
-    if max_depth != -1 and current_depth > max_depth:
-        return
-
+    prefix = os.path.join(directory, '')
+    contains_all = contains_mode == 'and'
+    dir_fd = None
     try:
-        with os.scandir(directory) as it:
+        if SCANDIR_SUPPORTS_FD:
+            # O_DIRECTORY makes the open fail rather than block if the path has been replaced by a FIFO
+            dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        with os.scandir(directory if dir_fd is None else dir_fd) as it:
             for entry in it:
-                if skip_hidden and entry.name.startswith('.'):
+                file_name = entry.name
+                # Index the first character directly; scandir never yields empty names
+                if skip_hidden and file_name[0] == '.':
                     continue  # Skip hidden files and directories
+
+                # Directories are identified from the cached entry type, without following symlinks
+                if entry.is_dir(follow_symlinks=False):
+                    if subdirectories is not None:
+                        subdirectories.append(prefix + file_name)
+                    continue
+
+                # The extension filter is the cheapest check, so it runs first and rejects files before any other work
+                if extensions:
+                    # Slice the extension off the last dot instead of calling os.path.splitext(); as with
+                    # splitext, leading dots (e.g. '.bashrc') do not start an extension
+                    ext_start = file_name.rfind('.')
+                    if (ext_start <= 0 or (file_name[0] == '.' and not file_name[:ext_start].strip('.'))
+                            or file_name[ext_start:].lower() not in extensions):
+                        continue  # Skip files that do not match the extensions
+
+                # **Updated: Apply --contains filter if specified with AND/OR logic**
+                if contains:
+                    # Determine comparison name based on case sensitivity
+                    comparison_name = file_name if case_sensitive else file_name.lower()
+
+                    if contains_all:
+                        # All substrings must be present
+                        if not all(substr in comparison_name for substr in contains):
+                            continue  # Skip files that do not contain all specified substrings
+                    elif not any(substr in comparison_name for substr in contains):
+                        # Any substring must be present
+                        continue  # Skip files that do not contain any of the specified substrings
+
+                # Checked last, as it has to stat symlinks (and entries of unknown type) to see what they point to
                 if entry.is_file():
-                    yield entry.path
-                elif entry.is_dir(follow_symlinks=False):
-                    yield from traverse_directory(entry.path, max_depth, skip_hidden, current_depth + 1)
+                    yield prefix, entry
     except PermissionError:
         print(f"Permission denied: '{directory}'. Skipping...", file=sys.stderr)
     except Exception as e:
         print(f"Error accessing directory '{directory}': {e}", file=sys.stderr)
+    finally:
+        if dir_fd is not None:
+            os.close(dir_fd)
+
+def traverse_directory(directory, max_depth, skip_hidden, extensions=None, contains=None,
+                       case_sensitive=False, contains_mode='or'):
+    """
+    Traverse the directory up to the specified depth.
+
+    Subdirectories are tracked on an explicit stack rather than by recursion, so deep trees
+    are not limited by the recursion limit. Entries must be stat'ed before the generator is
+    advanced (see scan_directory()).
+
+    Args:
+        directory (str): The directory to traverse.
+        max_depth (int): Maximum depth to traverse. -1 for unlimited.
+        skip_hidden (bool): Whether to skip hidden files and directories.
+        extensions (frozenset, optional): Set of normalized file extensions to filter by.
+        contains (list, optional): List of substrings to filter file names, lowercased unless case_sensitive.
+        case_sensitive (bool): Whether the --contains filter is case-sensitive.
+        contains_mode (str): Logical operation for multiple substrings ('and' or 'or').
+
+    Yields:
+        tuple: Directory prefix and the os.DirEntry of each file that passes the filters.
+    """
+    # As with any depth below the starting one, depths below -1 list nothing
+    if max_depth < -1:
+        return
+
+    stack = [(directory, 0)]
+    while stack:
+        directory, current_depth = stack.pop()
+        subdirectories = [] if max_depth == -1 or current_depth < max_depth else None
+        yield from scan_directory(directory, skip_hidden, subdirectories, extensions,
+                                  contains, case_sensitive, contains_mode)
+        if subdirectories:
+            # Reversed so that subdirectories are popped in the order they were found
+            stack.extend((subdirectory, current_depth + 1) for subdirectory in reversed(subdirectories))
+
+def add_sort_keys(entries, sort_by='name'):
+    """
+    Yield each file's directory prefix and name along with its sort key.
+
+    The full path is not built here: all files of a directory share one prefix string, so
+    keeping the two parts apart until the paths are written saves a string per file in
+    sorted listings, which are held in memory.
+
+    Args:
+        entries (iterable): Iterable of (directory prefix, os.DirEntry) tuples.
+        sort_by (str): Criterion to sort by ('none', 'name', 'size', 'date').
+
+    Yields:
+        tuple: Sort key (None when not sorting), directory prefix, and file name.
+    """
+    # Only the size and date sorts read file metadata; every other listing avoids the stat call entirely
+    need_stat = sort_by in ('size', 'date')
+    sort_by_size = sort_by == 'size'
+    sort_by_name = sort_by == 'name'
+
+    for prefix, entry in entries:
+        file_name = entry.name
+        if need_stat:
+            file_info = get_file_info(prefix, entry)
+            if not file_info:
+                continue
+            sort_key = file_info.st_size if sort_by_size else file_info.st_mtime
+        elif sort_by_name:
+            sort_key = file_name.lower()
+        else:
+            sort_key = None
+        yield sort_key, prefix, file_name
+
+def find_files(directory, extensions=None, sort_by='name', depth=-1, skip_hidden=False,
+               contains=None, case_sensitive=False, contains_mode='or'):
+    """
+    Traverse a single directory and yield the files that pass the filters.
+
+    Args:
+        directory (str): The directory to traverse.
+        extensions (frozenset, optional): Set of normalized file extensions to filter by.
+        sort_by (str): Criterion to sort by ('none', 'name', 'size', 'date').
+        depth (int): Maximum depth for directory traversal. -1 for unlimited.
+        skip_hidden (bool): Whether to skip hidden files and directories.
+        contains (list, optional): List of substrings to filter file names, lowercased unless case_sensitive.
+        case_sensitive (bool): Whether the --contains filter is case-sensitive.
+        contains_mode (str): Logical operation for multiple substrings ('and' or 'or').
+
+    Yields:
+        tuple: Sort key (None when not sorting), directory prefix, and file name.
+    """
+    yield from add_sort_keys(traverse_directory(directory, depth, skip_hidden, extensions,
+                                                contains, case_sensitive, contains_mode), sort_by)
+
+def iter_files(directories, extensions=None, sort_by='name', order='asc', depth=-1, skip_hidden=False,
+               contains=None, case_sensitive=False, contains_mode='or', workers=1):
+    """
+    Yield the files found across several directories, scanning directories in parallel if requested.
+
+    With a single worker the directories are traversed in order in the calling thread. With more,
+    every directory in the trees is scanned as a separate thread pool task and the files are
+    yielded as the scans complete, so the order is not deterministic. When sorting, each task
+    also sorts its own files, so the final sort only has to merge these presorted runs.
+
+    Args:
+        directories (list): List of existing directories to traverse.
+        extensions (frozenset, optional): Set of normalized file extensions to filter by.
+        sort_by (str): Criterion to sort by ('none', 'name', 'size', 'date').
+        order (str): Order of sorting ('asc' or 'desc').
+        depth (int): Maximum depth for directory traversal. -1 for unlimited.
+        skip_hidden (bool): Whether to skip hidden files and directories.
+        contains (list, optional): List of substrings to filter file names, lowercased unless case_sensitive.
+        case_sensitive (bool): Whether the --contains filter is case-sensitive.
+        contains_mode (str): Logical operation for multiple substrings ('and' or 'or').
+        workers (int): Number of threads scanning directories.
+
+    Yields:
+        tuple: Sort key (None when not sorting), directory prefix, and file name.
+    """
+    if workers <= 1:
+        for directory in directories:
+            yield from find_files(directory, extensions, sort_by, depth, skip_hidden,
+                                  contains, case_sensitive, contains_mode)
+        return
+
+    def scan(directory, current_depth):
+        # Filtering and stat'ing happen in the worker too, while the directory descriptor is open
+        subdirectories = [] if depth == -1 or current_depth < depth else None
+        files = list(add_sort_keys(scan_directory(directory, skip_hidden, subdirectories, extensions,
+                                                  contains, case_sensitive, contains_mode), sort_by))
+        if sort_by != 'none':
+            # Sorting each directory's files here overlaps with the other scans waiting on the filesystem,
+            # and the final sort detects the presorted runs and merges them. Like the final sort, it
+            # compares whole tuples, so the runs are in the order that sort expects
+            files.sort(reverse=order == 'desc')
+        return files, subdirectories, current_depth
+
+    # As in traverse_directory(), depths below -1 list nothing
+    if depth < -1:
+        return
+
+    # scandir and stat release the GIL while they wait on the filesystem, so the scans overlap.
+    # Each completed scan queues its subdirectories until no scans are pending.
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = {executor.submit(scan, directory, 0) for directory in directories}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, subdirectories, current_depth = future.result()
+                for subdirectory in subdirectories or ():
+                    pending.add(executor.submit(scan, subdirectory, current_depth + 1))
+                yield from files
+
+def write_file_list(f, files, output_format='txt'):
+    """
+    Write the file paths to an open output file in batches.
+
+    Args:
+        f (file object): The open output file.
+        files (iterable): Iterable of (sort key, directory prefix, file name) tuples.
+        output_format (str): The desired output format ('txt' or 'html').
+
+    Returns:
+        int: Number of file paths written.
+    """
+    total_files = 0
+    paths = (prefix + file_name for _, prefix, file_name in files)
+    while True:
+        batch = list(islice(paths, WRITE_BATCH_SIZE))
+        if not batch:
+            break
+        total_files += len(batch)
+        if output_format == 'html':
+            # Escape HTML characters and convert Windows paths to file URLs, writing the batch in a single call
+            f.write(''.join([f'  <li><a href="{path_to_file_url(file_path)}">{html.escape(file_path)}</a></li>\n'
+                             for file_path in batch]))
+        else:
+            # Write the whole batch, one path per line, in a single call instead of one write per file
+            f.write('\n'.join(batch) + '\n')
+    return total_files
+
+def is_within_directories(path, directories):
+    """
+    Check whether a path lies inside any of the given directories, following symlinks.
+
+    Args:
+        path (str): The path to check.
+        directories (list): List of directories.
+
+    Returns:
+        bool: True if the path is inside one of the directories.
+    """
+    real_path = os.path.realpath(path)
+    for directory in directories:
+        real_directory = os.path.realpath(directory)
+        try:
+            if os.path.commonpath((real_path, real_directory)) == real_directory:
+                return True
+        except ValueError:
+            continue  # Paths on different drives cannot contain each other
+    return False
 
 def list_files(directories, output_file, extensions=None, sort_by='name', order='asc',
               depth=-1, skip_hidden=False, output_format='txt', contains=None, 
-              case_sensitive=False, contains_mode='or'):
+              case_sensitive=False, contains_mode='or', workers=1):
     """
     Traverse the directories, list all files with optional filtering and sorting, and write their paths to the output file.
 
+    Unsorted listings are written while the directories are traversed, so memory use does not grow
+    with the number of files; their total is written into space reserved at the top of the file, so the
+    count is padded with trailing spaces. Outputs that cannot seek, such as pipes, and outputs inside
+    the scanned directories are written after the traversal instead, with the exact count.
+
     Args:
         directories (list): List of directories to traverse.
         output_file (str): The file to write the list of file paths.
@@ -208,87 +530,88 @@ def list_files(directories, output_file, extensions=None, sort_by='name', order=
         contains (list, optional): List of substrings to filter file names.
         case_sensitive (bool): Whether the --contains filter is case-sensitive.
         contains_mode (str): Logical operation for multiple substrings ('and' or 'or').
+        workers (int): Number of threads scanning directories in parallel.
 
     Returns:
         int: Total number of files listed.
     """
-    files_list = []
-    total_files = 0
-
     # Normalize extensions if provided
     if extensions:
-        extensions = [ext.lower() if ext.startswith('.') else f'.{ext.lower()}' for ext in extensions]
+        extensions = normalize_extensions(tuple(extensions))
+
+    # Lowercase the --contains substrings once, rather than for every file, when matching is case-insensitive
+    if contains and not case_sensitive:
+        contains = [substr.lower() for substr in contains]
 
+    valid_directories = []
     for directory in directories:
         if not os.path.isdir(directory):
             print(f"Warning: The directory '{directory}' does not exist or is not accessible. Skipping...", file=sys.stderr)
             continue
+        valid_directories.append(directory)
 
-        for file_path in traverse_directory(directory, depth, skip_hidden):
-            file_name = os.path.basename(file_path)
-            
-            # **Updated: Apply --contains filter if specified with AND/OR logic**
-            if contains:
-                # Determine comparison name based on case sensitivity
-                comparison_name = file_name if case_sensitive else file_name.lower()
-                # Prepare substrings based on case sensitivity
-                substrings = contains if case_sensitive else [substr.lower() for substr in contains]
-                
-                if contains_mode == 'and':
-                    # All substrings must be present
-                    if not all(substr in comparison_name for substr in substrings):
-                        continue  # Skip files that do not contain all specified substrings
-                elif contains_mode == 'or':
-                    # Any substring must be present
-                    if not any(substr in comparison_name for substr in substrings):
-                        continue  # Skip files that do not contain any of the specified substrings
-            
-            if extensions:
-                file_ext = os.path.splitext(file_path)[1].lower()
-                if file_ext not in extensions:
-                    continue  # Skip files that do not match the extensions
-            file_info = get_file_info(file_path)
-            if file_info:
-                files_list.append((file_path, file_info))
-                total_files += 1
-
-    # Sorting
+    files = iter_files(valid_directories, extensions, sort_by, order, depth, skip_hidden,
+                       contains, case_sensitive, contains_mode, workers)
+
+    # Sorting on the precomputed keys, so each name is lowercased once rather than per comparison.
+    # The tuples are compared whole, so files with equal keys are ordered by path rather than by
+    # the order the scans happened to finish in.
     if sort_by != 'none':
         reverse_order = True if order == 'desc' else False
-        if sort_by == 'name':
-            files_list.sort(key=lambda x: x[1]['name'].lower(), reverse=reverse_order)
-        elif sort_by == 'size':
-            files_list.sort(key=lambda x: x[1]['size'], reverse=reverse_order)
-        elif sort_by == 'date':
-            files_list.sort(key=lambda x: x[1]['date'], reverse=reverse_order)
-    # If sort_by is 'none', retain the original traversal order
+        files = sorted(files, reverse=reverse_order)
+        count_text = str(len(files))
+    elif is_within_directories(output_file, valid_directories):
+        # Streaming would create the output file inside a tree that is still being scanned, listing the
+        # output itself, so the files are collected before it is opened
+        files = list(files)
+        count_text = str(len(files))
+    else:
+        # Retain the original traversal order; the files are streamed to the output if it can seek back to the total
+        count_text = None
 
     # Write to output file based on the chosen format
     try:
-        if output_format == 'html':
-            with open(output_file, 'w', encoding='utf-8') as f:
+        # A large buffer turns the many short writes into few write syscalls; newline='\n' skips line-ending translation
+        with open(output_file, 'w', encoding='utf-8', buffering=OUTPUT_BUFFER_SIZE, newline='\n') as f:
+            # Reserve space for the total until it is known; pipes and FIFOs cannot seek back to fill it in,
+            # so their files are collected first instead
+            streamed = count_text is None and f.seekable()
+            if streamed:
+                count_text = ' ' * COUNT_WIDTH
+            elif count_text is None:
+                files = list(files)
+                count_text = str(len(files))
+
+            if output_format == 'html':
                 f.write('<!DOCTYPE html>\n<html lang="en">\n<head>\n')
                 f.write('<meta charset="UTF-8">\n')
                 f.write('<meta name="viewport" content="width=device-width, initial-scale=1.0">\n')
                 f.write(f'<title>File List - {time.strftime("%Y-%m-%d %H:%M:%S")}</title>\n')
                 f.write('</head>\n<body>\n')
-                f.write(f'<h1>Total number of files: {total_files}</h1>\n')
+                f.write('<h1>Total number of files: ')
+                if streamed:
+                    count_offset = f.tell()
+                f.write(f'{count_text}</h1>\n')
                 f.write('<ul>\n')
-                for file_path, _ in files_list:
-                    # Escape HTML characters and convert Windows paths to file URLs
-                    escaped_path = html.escape(file_path)
-                    file_url = path_to_file_url(file_path)
-                    f.write(f'  <li><a href="{file_url}">{escaped_path}</a></li>\n')
+                total_files = write_file_list(f, files, output_format)
                 f.write('</ul>\n')
                 f.write('</body>\n</html>')
-        else:
-            with open(output_file, 'w', encoding='utf-8') as f:
+            else:
                 # Write total number of files as the first line
-                f.write(f"Total number of files: {total_files}\n")
-                # Write each file path on a new line
-                for file_path, _ in files_list:
-                    f.write(file_path + '\n')
-    except Exception as e:
+                f.write('Total number of files: ')
+                if streamed:
+                    count_offset = f.tell()
+                f.write(f'{count_text}\n')
+                total_files = write_file_list(f, files, output_format)
+
+            # Fill in the total of a streamed listing now that it is known
+            if streamed:
+                f.seek(count_offset)
+                f.write(f'{total_files:<{COUNT_WIDTH}}')
+    # Only errors from opening and writing the output are reported as write errors; unsorted listings are
+    # traversed inside this block, and anything unexpected from the traversal should not be mistaken for one.
+    # UnicodeEncodeError covers file names that are not valid UTF-8.
+    except (OSError, UnicodeEncodeError) as e:
         print(f"Error writing to file '{output_file}': {e}", file=sys.stderr)
         sys.exit(1)
 
@@ -307,6 +630,7 @@ def main():
     contains = args.contains  # List of substrings for --contains
     case_sensitive = args.case_sensitive  # Whether matching is case-sensitive
     contains_mode = args.contains_mode  # 'and' or 'or' for substring matching
+    workers = args.workers  # Number of threads scanning directories
 
     # Generate the output file name with appropriate extension
     output_file = generate_output_filename(provided_output, output_format)
@@ -323,7 +647,8 @@ def main():
         output_format,
         contains,
         case_sensitive,
-        contains_mode  # Pass the contains_mode parameter
+        contains_mode,  # Pass the contains_mode parameter
+        workers
     )
 
     print(f"File list has been written to '{output_file}'.")